@@ -1,4 +1,4 @@
-from flask import Flask, render_template, request, redirect, url_for, session, flash, send_from_directory, abort, jsonify
+from flask import Flask, render_template, request, redirect, url_for, session, flash, send_from_directory, abort, jsonify, g
 import mysql.connector
 from bcrypt import hashpw, gensalt, checkpw
 from werkzeug.utils import secure_filename
@@ -7,12 +7,12 @@ import zipfile
 import shutil
 from datetime import datetime
 import re
+import time
 import mimetypes
 from functools import wraps
 from uuid import uuid4
-import logging
-from logging.handlers import RotatingFileHandler
 from mail_zoho import BoasVindas
+from logging_config import setup_logging
 from dotenv import load_dotenv
 from json import loads
 
@@ -22,24 +22,32 @@ app = Flask(__name__)
 app.secret_key = os.getenv("SECRET_KEY")
 app.config['MAX_CONTENT_LENGTH'] = 10 * 1024 * 1024  # 10MB max file size
 
-def setup_logging():
-    handler = RotatingFileHandler(os.getenv("LOG_FILE"), maxBytes=1000000, backupCount=3)
-    handler.setLevel(logging.INFO)
-    formatter = logging.Formatter(
-        '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
+setup_logging(app)
+
+# Request IDs accepted from the X-Request-ID header
+REQUEST_ID_PATTERN = re.compile(r'[A-Za-z0-9-]{1,64}')
+
+@app.before_request
+def start_request_timer():
+    """Assign a request ID and start timing the request"""
+    request_id = request.headers.get('X-Request-ID', '')
+    g.request_id = request_id if REQUEST_ID_PATTERN.fullmatch(request_id) else uuid4().hex
+    g.start_time = time.perf_counter()
+
+@app.after_request
+def log_access(response):
+    """Emit a structured access log entry for the request"""
+    app.logger.info(
+        '%s %s %s', request.method, request.path, response.status_code,
+        extra={
+            'access': True,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+        }
     )
-    handler.setFormatter(formatter)
-
-    # Logger do Flask app
-    app.logger.addHandler(handler)
-    app.logger.setLevel(logging.INFO)
-
-    # Logger do Werkzeug (logs de requisição HTTP)
-    werkzeug_logger = logging.getLogger('werkzeug')
-    werkzeug_logger.addHandler(handler)
-    werkzeug_logger.setLevel(logging.INFO)
-
-# setup_logging()
+    response.headers['X-Request-ID'] = g.get('request_id', '')
+    return response
 
 # Database configuration
 DB_CONFIG = {
@@ -63,7 +71,7 @@ def get_db_connection():
         conn = mysql.connector.connect(**DB_CONFIG)
         return conn
     except mysql.connector.Error as e:
-        print(f"Database connection error: {e}")
+        app.logger.error("Database connection error: %s", e)
         return None
 
 def login_required(f):
@@ -164,7 +172,7 @@ def register():
             
         except mysql.connector.Error as e:
             flash('Registration failed. Please try again.', 'danger')
-            print(f"Registration error: {e}")
+            app.logger.error("Registration error: %s", e)
         finally:
             conn.close()
     
@@ -201,7 +209,7 @@ def login():
                 
         except mysql.connector.Error as e:
             flash('Login failed. Please try again.', 'danger')
-            print(f"Login error: {e}")
+            app.logger.error("Login error: %s", e)
         finally:
             conn.close()
     
@@ -231,13 +239,13 @@ def dashboard():
         )
         projects = cursor.fetchall()
 
-        print(f"dash ativado: INFO: {projects}")
+        app.logger.info("Dashboard loaded with %d projects", len(projects))
         
         return render_template('dashboard.html', projects=projects, project_count=len(projects))
         
     except mysql.connector.Error as e:
         flash('Error loading dashboard.', 'danger')
-        print(f"Dashboard error: {e}")
+        app.logger.error("Dashboard error: %s", e)
         return redirect(url_for('index'))
     finally:
         conn.close()
@@ -282,7 +290,7 @@ def upload_project():
             
             # Create project directory
             project_id = str(uuid4())
-            print(project_id)
+            app.logger.info("Creating project %s", project_id)
             project_dir = os.path.join(UPLOAD_FOLDER, project_id)
             os.makedirs(project_dir, exist_ok=True)
             
@@ -344,7 +352,7 @@ def upload_project():
             
         except mysql.connector.Error as e:
             flash('Upload failed. Please try again.', 'danger')
-            print(f"Upload error: {e}")
+            app.logger.error("Upload error: %s", e)
         finally:
             conn.close()
     
@@ -389,7 +397,7 @@ def edit_project(project_id):
         
     except mysql.connector.Error as e:
         flash('Error loading project.', 'danger')
-        print(f"Edit project error: {e}")
+        app.logger.error("Edit project error: %s", e)
         return redirect(url_for('dashboard'))
     finally:
         conn.close()
@@ -431,6 +439,7 @@ def get_file_content(project_id, file_path):
             return jsonify({'error': 'File is not text-based'}), 400
         
     except mysql.connector.Error as e:
+        app.logger.error("File access error: %s", e)
         return jsonify({'error': 'Database error'}), 500
     finally:
         conn.close()
@@ -468,9 +477,11 @@ def save_file_content(project_id, file_path):
                 f.write(content)
             return jsonify({'success': True})
         except Exception as e:
+            app.logger.exception("Failed to save file %s", file_path)
             return jsonify({'error': f'Failed to save file: {str(e)}'}), 500
         
     except mysql.connector.Error as e:
+        app.logger.error("File access error: %s", e)
         return jsonify({'error': 'Database error'}), 500
     finally:
         conn.close()
@@ -478,8 +489,8 @@ def save_file_content(project_id, file_path):
 @app.route('/delete_project/<project_id>')
 @login_required
 def delete_project(project_id):
-    print(f"delete {project_id}")
     """Delete a project"""
+    app.logger.info("Deleting project %s", project_id)
     conn = get_db_connection()
     if not conn:
         flash('Database connection error.', 'danger')
@@ -510,7 +521,7 @@ def delete_project(project_id):
         
     except mysql.connector.Error as e:
         flash('Error deleting project.', 'danger')
-        print(f"Delete error: {e}")
+        app.logger.error("Delete error: %s", e)
     finally:
         conn.close()
     
@@ -558,7 +569,7 @@ def serve_project(project_id, filename='index.html'):
         return send_from_directory(project_dir, filename, mimetype=mimetype)
         
     except mysql.connector.Error as e:
-        print(f"Serve project error: {e}")
+        app.logger.error("Serve project error: %s", e)
         abort(500)
     finally:
         conn.close()
@@ -0,0 +1,166 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from os import getenv
+
+from flask import g, has_request_context, request
+from flask.logging import default_handler
+
+# Rotas com muito tráfego cujos logs de acesso podem ser amostrados
+SAMPLED_ROUTES = {"serve_project"}
+
+# Campos de contexto adicionados a cada registro
+CONTEXT_FIELDS = ("request_id", "route", "project_id", "duration_ms")
+
+
+class RequestContextFilter(logging.Filter):
+    """Attach request ID, route, project ID and duration to log records"""
+
+    def filter(self, record):
+        if has_request_context():
+            view_args = request.view_args or {}
+            if getattr(record, "request_id", None) is None:
+                record.request_id = g.get("request_id")
+            if getattr(record, "route", None) is None:
+                record.route = request.endpoint
+            if getattr(record, "project_id", None) is None:
+                record.project_id = view_args.get("project_id")
+            if getattr(record, "duration_ms", None) is None and "start_time" in g:
+                record.duration_ms = round((time.perf_counter() - g.start_time) * 1000, 2)
+        return True
+
+
+class AccessSamplingFilter(logging.Filter):
+    """Keep only a fraction of access logs for high-volume routes"""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if not getattr(record, "access", False) or self.rate >= 1.0:
+            return True
+        if getattr(record, "route", None) not in SAMPLED_ROUTES:
+            return True
+        # Erros nunca são descartados
+        if record.levelno >= logging.WARNING or getattr(record, "status", 0) >= 500:
+            return True
+        if random.random() >= self.rate:
+            return False
+        record.sample_rate = self.rate
+        return True
+
+
+class WerkzeugRequestFilter(logging.Filter):
+    """Drop the per-request lines of the werkzeug dev server, already covered by the access log"""
+
+    def filter(self, record):
+        # Formato usado por WSGIRequestHandler.log_request
+        return not (isinstance(record.msg, str) and record.msg.endswith('"%s" %s %s'))
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Queue handler that drops records instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            # Avisa quantos registros foram perdidos assim que a fila libera espaço
+            if self.dropped:
+                self.queue.put_nowait(self.dropped_record())
+                self.dropped = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def dropped_record(self):
+        """Build a warning record reporting how many records were dropped"""
+        return logging.makeLogRecord({
+            "name": __name__,
+            "levelno": logging.WARNING,
+            "levelname": "WARNING",
+            "msg": "Log queue full, dropped=%d records",
+            "args": (self.dropped,),
+        })
+
+
+class JsonFormatter(logging.Formatter):
+    """Format log records as one JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            entry[field] = getattr(record, field, None)
+        if getattr(record, "access", False):
+            entry["access"] = True
+            entry["method"] = getattr(record, "method", None)
+            entry["path"] = getattr(record, "path", None)
+            entry["status"] = getattr(record, "status", None)
+        if getattr(record, "sample_rate", None) is not None:
+            entry["sample_rate"] = record.sample_rate
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def setup_logging(app):
+    """Route app, werkzeug and mail logs through a queue drained by a background thread"""
+    # Configurações de log, lidas depois do load_dotenv() do app
+    log_file = getenv("LOG_FILE")
+    log_queue_size = int(getenv("LOG_QUEUE_SIZE", "10000"))
+    access_log_sample_rate = float(getenv("ACCESS_LOG_SAMPLE_RATE", "1.0"))
+
+    if log_file:
+        output = RotatingFileHandler(log_file, maxBytes=1000000, backupCount=3, encoding="utf-8")
+    else:
+        output = logging.StreamHandler(sys.stderr)
+    output.setLevel(logging.INFO)
+    output.setFormatter(JsonFormatter())
+
+    # O contexto da requisição é capturado na thread da requisição, antes de enfileirar
+    log_queue = queue.Queue(log_queue_size)
+    handler = NonBlockingQueueHandler(log_queue)
+    handler.setLevel(logging.INFO)
+    handler.addFilter(RequestContextFilter())
+    handler.addFilter(AccessSamplingFilter(access_log_sample_rate))
+
+    listener = QueueListener(log_queue, output, respect_handler_level=True)
+    listener.start()
+
+    def stop_listener():
+        listener.stop()
+        if handler.dropped:
+            output.handle(handler.dropped_record())
+
+    atexit.register(stop_listener)
+
+    # Remove o handler síncrono padrão do Flask
+    app.logger.removeHandler(default_handler)
+
+    # Logger do Flask app, do Werkzeug e do envio de e-mails
+    werkzeug_logger = logging.getLogger("werkzeug")
+    for logger in (app.logger, werkzeug_logger, logging.getLogger("mail_zoho")):
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+    # Linhas de requisição do Werkzeug ficam fora da fila; o log de acesso já as cobre
+    werkzeug_logger.addFilter(WerkzeugRequestFilter())
+
+    # Mensagens de inicialização e o PIN do debugger continuam no console
+    if log_file:
+        werkzeug_logger.addHandler(logging.StreamHandler(sys.stderr))
+
+    return listener
@@ -3,9 +3,12 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from dotenv import load_dotenv
 from os import getenv
+import logging
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Configurações do servidor de e-mail (pode ser Gmail, Zoho, etc.)
 SMTP_SERVER = getenv("SMTP_SERVER")
 SMTP_PORT = getenv("SMTP_PORT")
@@ -62,7 +65,7 @@ class EmailService:
                 server.sendmail(self.remetente, destinatario, msg.as_string())
             return True
         except Exception as e:
-            print("Erro ao enviar e-mail:", e)
+            logger.error("Erro ao enviar e-mail para %s: %s", destinatario, e)
             return False
 
 def BoasVindas(nome, email):